@@ -1,9 +1,14 @@
 import os
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 import rksim.exceptions as ex
 from typing import List
 from rksim.fit import fit
-from rksim.plotting import plot
+
+# Arrays parsed from data files as {path: ((modification time (ns), size),
+# array)}, keeping at most max_parsed_arrays of the most recently parsed
+_parsed_arrays = {}
+max_parsed_arrays = 32
 
 
 class TimeSeries:
@@ -17,12 +22,13 @@ class TimeSeries:
         for array in [self.times, self.concentrations]:
             assert type(array) is np.ndarray
 
-            # Should be able to convert all values in the array to a float
-            for value in array:
+            # Numeric arrays are always convertible, otherwise try to convert
+            # the whole array at once rather than element-wise
+            if array.dtype.kind not in 'biuf':
                 try:
-                    float(value)
+                    array.astype(np.float64)
                 except (ValueError, TypeError):
-                    raise AssertionError(f'Could not convert {value} to float')
+                    raise AssertionError(f'Could not convert {array} to float')
 
         # Times and concentrations need to be the same length to be plotted
         # against one another
@@ -30,7 +36,7 @@ class TimeSeries:
 
         # Times should be monotonically increasing so the difference in
         # consecutive elements should all be positive
-        if np.min(np.diff(self.times)) < 0:
+        if not np.all(np.diff(self.times) >= 0):
             raise AssertionError('Time was not monotonically increasing for '
                                  f'{self.name}. Position: '
                                  f'{np.argmin(np.diff(self.times))}')
@@ -38,13 +44,20 @@ class TimeSeries:
     def save(self):
         """Save a numpy array of the data as a csv file"""
         name = f'{self.name}_sim' if self.is_simulated else self.name
+
+        # Write the columns directly, rather than transposing a stacked copy
+        array = np.empty(shape=(len(self.times), 2))
+        array[:, 0] = self.times
+        array[:, 1] = self.concentrations
+
         np.savetxt(f'{name}.csv',
-                   np.vstack((self.times, self.concentrations)).T,
+                   array,
                    header='Time  Concentration',
                    delimiter=',')
         return None
 
-    def __init__(self, name, times, concentrations, simulated=False):
+    def __init__(self, name, times, concentrations, simulated=False,
+                 check=True):
         """
         Concentration of a reactant/product/intermediate as a function of time.
 
@@ -58,6 +71,9 @@ class TimeSeries:
                                be identical to times
 
         :param simulated: (bool) Is this time series simulated or experimental
+
+        :param check: (bool) Check the times and concentrations are valid.
+                      Only skip if they are known to be e.g. already checked
         """
         self.name = str(name)
         self.is_simulated = simulated
@@ -65,7 +81,8 @@ class TimeSeries:
         self.times = times
         self.concentrations = concentrations
 
-        self._check()
+        if check:
+            self._check()
 
 
 class Data:
@@ -76,17 +93,17 @@ class Data:
     def __add__(self, other):
         """Add another time-series or list of time series onto this dataset"""
 
-        # Add a list or set of time series
-        if type(other) is list or type(other) is set:
-            assert all(isinstance(item, TimeSeries) for item in other)
-            self._list += other
-
         # Add a time series
         if isinstance(other, TimeSeries):
             self._list.append(other)
 
+        # Add a list or set of time series
+        elif isinstance(other, (list, set)):
+            assert all(isinstance(item, TimeSeries) for item in other)
+            self._list += other
+
         # Add another set of data
-        if isinstance(other, Data):
+        elif isinstance(other, Data):
             self._list += other._list
 
         return self
@@ -107,18 +124,21 @@ class Data:
     def assign(self, system):
         """Assign time series to components in a system of reactions"""
 
-        for time_series in self._list:
-            for i in system.network.nodes:
-                node = system.network.nodes[i]
-                species = node['species']
+        nodes = system.network.nodes
+        mapping = system.network.node_mapping
 
-                # If the name of the series is the same as the species
-                # then assign it a time series
-                if time_series.name == species.name:
-                    species.series = time_series
+        # If the name of the series is the same as a species then assign
+        # it a time series
+        series_list = [series for series in self._list
+                       if series.name in mapping]
 
-                    # Initial concentration for this component
-                    node['c0'] = time_series.concentrations[0]
+        for series in series_list:
+            nodes[mapping[series.name]]['species'].series = series
+
+        # Initial concentrations for these components
+        system.set_initial_concentrations(
+            names=[series.name for series in series_list],
+            cs=[series.concentrations[0] for series in series_list])
 
         return None
 
@@ -127,8 +147,30 @@ class Data:
         self.assign(system)
         return fit(self, system, optimise, max_time)
 
+    def fit_batch(self, systems, optimise=True, max_time=None, n_cores=None):
+        """
+        Fit a list of independent systems to these data in parallel, with
+        each fit in a separate process. The systems are copied to the
+        processes so are not modified, the fitted copies are returned
+
+        :param systems: (list(rksim.systems.System))
+
+        :param n_cores: (int | None) Maximum number of processes to use. If
+                        None then use all the cores available
+
+        :return: (list(rksim.systems.System)) Fitted systems
+        """
+        with ProcessPoolExecutor(max_workers=n_cores) as executor:
+            futures = [executor.submit(_fit_system, self, system, optimise,
+                                       max_time)
+                       for system in systems]
+
+            return [future.result() for future in futures]
+
     def plot(self, name=None):
         """Plot the data with matplotlib"""
+        from rksim.plotting import plot
+
         return plot(self._list, name=name)
 
     def __init__(self, *args):
@@ -151,6 +193,12 @@ class Data:
         self.fits = None
 
 
+def _fit_system(data, system, optimise, max_time):
+    """Fit a system to some data and return it, for use in a subprocess"""
+    data.fit(system, optimise=optimise, max_time=max_time)
+    return system
+
+
 def extract_data(filename, **kwargs) -> List[TimeSeries]:
     """
     Extract data from a file. Expecting a format similar to the following .csv
@@ -201,7 +249,9 @@ def extract_data(filename, **kwargs) -> List[TimeSeries]:
     # There are more than 1 concentrations given as a function of time
     series_list = []
 
-    # Iterate through the columns adding a time series for that component
+    # Iterate through the columns adding a time series for that component.
+    # All the columns are floats and share the same times so only need to
+    # check the first time series
     for i in range(1, n_columns):
 
         # Name can be defined in the keyword arguments
@@ -212,14 +262,27 @@ def extract_data(filename, **kwargs) -> List[TimeSeries]:
             name = f'{base_fn}_{i}'
 
         series = TimeSeries(name, times,
-                            concentrations=array[:, i])
+                            concentrations=array[:, i],
+                            check=(i == 1))
         series_list.append(series)
 
     return series_list
 
 
 def get_raw_data_array(filename):
-    """Get a data array (matrix) from a file"""
+    """
+    Get a data array (matrix) from a file. Parsed arrays are cached, so
+    extracting data from the same unmodified file again doesn't re-parse it
+    """
+    path = os.path.abspath(filename)
+
+    # A file rewritten within the resolution of a float modification time
+    # would still match, so also compare the size
+    stat = os.stat(filename)
+    key = (stat.st_mtime_ns, stat.st_size)
+
+    if path in _parsed_arrays and _parsed_arrays[path][0] == key:
+        return _parsed_arrays[path][1].copy()
 
     data_file = open(filename, 'r')
 
@@ -231,37 +294,59 @@ def get_raw_data_array(filename):
 
     data_file.close()
 
-    # Ensure the array is regular..
-    first_row_length = len(array[0])
+    # Arrays from get_raw_data_from_* are always regular, so no need to check
+    # the row lengths here
+    _parsed_arrays.pop(path, None)
+    _parsed_arrays[path] = (key, array)
 
-    # All the rows must be the same length
-    if not all(len(row) == first_row_length for row in array):
-        raise ex.DataMalformatted
+    # Only keep the most recently parsed arrays, removing the oldest
+    if len(_parsed_arrays) > max_parsed_arrays:
+        _parsed_arrays.pop(next(iter(_parsed_arrays)))
 
-    return array
+    return array.copy()
 
 
 def get_raw_data_from_csv(csv_file):
     """
-    Extract the data from a .csv file into a numpy array
+    Extract the data from a .csv file into a numpy array. Title lines at
+    the top of the file are skipped and the rest parsed in one go with
+    np.loadtxt. If there are any non-numeric rows in the body of the file
+    then fall back to parsing line-by-line, skipping those rows
 
     :param csv_file: (file)
     :return: (np.ndarray)
     """
-    array = []
+    lines = csv_file.readlines()
+
+    # Number of lines before the first that is all numbers e.g. a title
+    n_title_lines = 0
+    for line in lines:
+        if _csv_row(line) is not None:
+            break
 
-    for line in csv_file:
-        items = line.split(',')
+        n_title_lines += 1
 
-        # Try and convert all the items in this row of the csv to a float,
-        # continue if this is not possible
-        try:
-            # Remove any whitespace from the data
-            row = [float(item.strip()) for item in items]
-            array.append(row)
+    if n_title_lines == len(lines):
+        raise ex.DataMalformatted('Found no data')
+
+    try:
+        array = np.loadtxt(lines[n_title_lines:], delimiter=',', ndmin=2)
+
+    except ValueError:
+        array = _get_raw_data_from_csv_lines(lines)
+
+    return array
 
-        except ValueError:
-            continue
+
+def _get_raw_data_from_csv_lines(lines):
+    """
+    Extract the data from a list of .csv lines, skipping any which cannot be
+    converted to floats
+
+    :param lines: (list(str))
+    :return: (np.ndarray)
+    """
+    array = [row for row in map(_csv_row, lines) if row is not None]
 
     if len(array) == 0:
         raise ex.DataMalformatted('Found no data')
@@ -271,3 +356,19 @@ def get_raw_data_from_csv(csv_file):
                                   'one missing value')
 
     return np.array(array)
+
+
+def _csv_row(line):
+    """
+    Convert a line of a .csv file into a list of floats
+
+    :param line: (str)
+    :return: (list(float) | None) None if any item is not a float
+    """
+    # Try and convert all the items in this row of the csv to a float,
+    # removing any whitespace
+    try:
+        return [float(item.strip()) for item in line.split(',')]
+
+    except ValueError:
+        return None
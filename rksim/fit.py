@@ -1,8 +1,12 @@
 from typing import Union
 from scipy.integrate import odeint
-from scipy.optimize import minimize
+from scipy.optimize import least_squares
 import numpy as np
 
+# Smallest initial rate constant in a fit. The first step of the optimiser
+# is scaled by the initial rate constants, so tiny ones never move
+min_init_k = 1E-6
+
 
 def fit(data, system, optimise: Union[list, bool], max_time=None):
     """
@@ -21,7 +25,7 @@ def fit(data, system, optimise: Union[list, bool], max_time=None):
     """
     system.set_stoichiometries()
 
-    init_concs = [system.network.nodes[i]['c0'] for i in system.network.nodes]
+    init_concs = system.initial_concentrations()
 
     # Array of times along which the ODE will be solved
     if max_time is None and data is not None:
@@ -29,7 +33,7 @@ def fit(data, system, optimise: Union[list, bool], max_time=None):
 
     times = np.linspace(0.0, max_time, num=10000)
 
-    if optimise is not False:
+    if optimise is not False and data is not None:
         # Minimise the difference between the simulated and observed data wrt.
         # the rate constants and set the optimised values
 
@@ -40,36 +44,85 @@ def fit(data, system, optimise: Union[list, bool], max_time=None):
             k_idxs_to_opt = np.array([idx for idx in optimise], dtype=int)
             init_ks = init_ks[k_idxs_to_opt]
 
-        result = minimize(mse,
-                          x0=init_ks,
-                          method='BFGS',
-                          args=(system, times, init_concs, k_idxs_to_opt),
-                          tol=0.01)
+        # Initial guesses must be within the bounds and large enough for the
+        # optimiser to take a usable first step, so start negative and tiny
+        # rate constants from min_init_k
+        init_ks = np.maximum(init_ks, min_init_k)
+
+        # Only the concentrations at the times in the data are needed for
+        # the residuals, so only integrate to those rather than all the times
+        data_times = np.unique(np.concatenate([[0.0]] + [series.times
+                                                         for series in data]))
 
-        # Rate constants must all be positive (abs(k)) is minimised in mse()
-        for i, idx in enumerate(k_idxs_to_opt):
-            system.set_rate_constant(idx, k=np.abs(result.x)[i])
+        # Least squares on the residuals rather than minimising the mse
+        # directly, with rate constants bounded to be positive. The dogbox
+        # method copes better with rate constants that are optimal at zero.
+        # The data points the residuals compare are found once
+        result = least_squares(residuals,
+                               x0=init_ks,
+                               bounds=(0.0, np.inf),
+                               method='dogbox',
+                               args=(system, data_times, init_concs,
+                                     k_idxs_to_opt,
+                                     system.data_idxs(data_times)))
 
-        return None
+        set_rate_constants(system, result.x, k_idxs_to_opt)
 
-    #                    dy/dt            y0        t    in scipy doc notation
-    concs = odeint(system.derivative, init_concs, times)
+    concs = integrate(system, init_concs, times)
 
     # Set the time series for all components in the system
     system.set_simulated(concs, times)
     return None
 
 
-def mse(rate_constants, system, times, init_concs, k_idxs_to_opt):
-    """Calculate the rel mean squared error for a system with a set of ks"""
+def residuals(rate_constants, system, times, init_concs, k_idxs_to_opt,
+              data_idxs=None):
+    """
+    Calculate the relative residuals for a system with a set of ks
 
-    # Set only the rate constants that are going to be optimised with the
-    # new values
-    for i, idx in enumerate(k_idxs_to_opt):
-        system.set_rate_constant(idx, k=rate_constants[i])
+    :param data_idxs: (tuple(np.ndarray) | None) Indexes of the simulated
+                      concentrations compared to the data, from
+                      system.data_idxs(times)
+    """
+    set_rate_constants(system, rate_constants, k_idxs_to_opt)
 
-    # Integrate the time forward and set the time series
-    concs = odeint(system.derivative, init_concs, times)
-    system.set_simulated(concs, times)
+    # Integrate the time forward. Only the final rate constants need time
+    # series, so the residuals are calculated directly from these
+    concs = integrate(system, init_concs, times)
+    residuals_ = system.residuals(relative=True,
+                                  concentrations=concs, times=times,
+                                  data_idxs=data_idxs)
+    return residuals_
+
+
+def set_rate_constants(system, rate_constants, k_idxs_to_opt):
+    """
+    Set only the rate constants that are going to be optimised with the new
+    values, in one go rather than one reaction at a time
+
+    :param system: (rksim.system.System)
+    :param rate_constants: (np.ndarray) shape = (l,)
+    :param k_idxs_to_opt: (list(int) | np.ndarray) Indexes of the rate
+                          constants in the system. shape = (l,)
+    """
+    ks = system.rate_constants()
+    ks[k_idxs_to_opt] = rate_constants
+
+    system.set_rate_constants(ks=ks)
+    return None
+
+
+def integrate(system, init_concs, times):
+    """
+    Integrate the concentrations of all species in a system forward in time,
+    with the current rate constants
+
+    :param system: (rksim.system.System)
+    :param init_concs: (np.ndarray) Initial concentrations shape = (m,)
+    :param times: (np.ndarray) Times to calculate the concentrations at
+    :return: (np.ndarray) Concentrations shape = (n, m)
+    """
+    derivative, jacobian, args = system.derivative_kernels()
 
-    return system.mse(relative=True)
+    #          dy/dt         y0        t    in scipy doc notation
+    return odeint(derivative, init_concs, times, args=args, Dfun=jacobian)
@@ -0,0 +1,172 @@
+import numpy as np
+
+try:
+    from numba import njit
+    has_numba = True
+
+except ImportError:
+    # Not installed, or installed but not supporting this version of numpy
+    has_numba = False
+
+    def njit(*args, **kwargs):
+        """Fallback if numba is not installed: don't compile the function"""
+
+        # Used as @njit
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+
+        # Used as @njit(...)
+        return lambda function: function
+
+
+@njit(cache=True)
+def int_power(x, n):
+    """
+    Raise x to an integer power n ≥ 0. Stoichiometries are nearly always 0
+    (padding), 1, 2 or 3, so multiply rather than calling pow for those
+
+    :param x: (float)
+    :param n: (int)
+    :return: (float)
+    """
+    if n == 0:
+        return 1.0
+
+    if n == 1:
+        return x
+
+    if n == 2:
+        return x * x
+
+    if n == 3:
+        return x * x * x
+
+    return x ** n
+
+
+@njit(cache=True)
+def derivative(concentrations, time, ks, r_idxs, r_stos, p_idxs, p_stos):
+    """
+    Calculate the derivative of all the concentrations with respect to time
+
+                                      __
+        dc_i/dt = (   Σ   S_{j,i} k_j  || c_k ^S_{j, k}  -
+                  ( j ∈ P              k
+                                      __
+                     Σ   S_{j,i} k_j  || c_k ^S_{j, k} )
+                    j ∈ R              k               )
+
+    where P is the set of reactions where i is a product and R is the
+    set of reactions where i is a reactant. Reactions are rows in the
+    index/stoichiometry arrays, with rows padded by zero stoichiometries
+
+    :param concentrations: (np.ndarray) shape = (m,)
+    :param time: (float) Time (s). Unused, but needed for integrators
+    :param ks: (np.ndarray) Rate constants. shape = (n,)
+    :param r_idxs: (np.ndarray) Indexes of the reactants. shape = (n, l)
+    :param r_stos: (np.ndarray) Stoichiometries of the reactants.
+                   shape = (n, l)
+    :param p_idxs: (np.ndarray) Indexes of the products. shape = (n, l')
+    :param p_stos: (np.ndarray) Stoichiometries of the products.
+                   shape = (n, l')
+    :return: (np.ndarray) shape = (m,)
+    """
+    dcdt = np.zeros_like(concentrations)
+
+    for j in range(ks.shape[0]):
+
+        # Rate of this reaction e.g. k[A][B]^2
+        rate = ks[j]
+        for k in range(r_idxs.shape[1]):
+            rate *= int_power(concentrations[r_idxs[j, k]], r_stos[j, k])
+
+        for k in range(r_idxs.shape[1]):
+            dcdt[r_idxs[j, k]] -= r_stos[j, k] * rate
+
+        for k in range(p_idxs.shape[1]):
+            dcdt[p_idxs[j, k]] += p_stos[j, k] * rate
+
+    return dcdt
+
+
+@njit(cache=True)
+def jacobian(concentrations, time, ks, r_idxs, r_stos, p_idxs, p_stos):
+    """
+    Calculate the Jacobian of the derivative, J_{i,l} = ∂(dc_i/dt)/∂c_l,
+    with arguments as for derivative(). Only reactants contribute to the rate
+    of a reaction so only the derivatives with respect to those are non-zero
+
+    :return: (np.ndarray) shape = (m, m)
+    """
+    n_species = concentrations.shape[0]
+    jac = np.zeros((n_species, n_species))
+
+    for j in range(ks.shape[0]):
+        for l in range(r_idxs.shape[1]):
+
+            if r_stos[j, l] == 0:
+                continue
+
+            # Derivative of the rate of this reaction with respect to the
+            # concentration of reactant l e.g. ∂(k[A][B]^2)/∂[B] = 2k[A][B]
+            drate = ks[j] * r_stos[j, l] * int_power(
+                concentrations[r_idxs[j, l]], r_stos[j, l] - 1)
+
+            for k in range(r_idxs.shape[1]):
+                if k != l:
+                    drate *= int_power(concentrations[r_idxs[j, k]],
+                                       r_stos[j, k])
+
+            col = r_idxs[j, l]
+            for k in range(r_idxs.shape[1]):
+                jac[r_idxs[j, k], col] -= r_stos[j, k] * drate
+
+            for k in range(p_idxs.shape[1]):
+                jac[p_idxs[j, k], col] += p_stos[j, k] * drate
+
+    return jac
+
+
+def vectorised_derivative(concentrations, time, ks, orders, net_stos):
+    """
+    Calculate the derivative of all the concentrations with respect to time
+    as a single matrix-vector product over all reactions. Used in place of
+    derivative() if numba is not installed, as the loops are slow in Python
+
+    :param concentrations: (np.ndarray) shape = (m,)
+    :param time: (float) Time (s). Unused, but needed for integrators
+    :param ks: (np.ndarray) Rate constants. shape = (n,)
+    :param orders: (np.ndarray) Stoichiometries of the reactants, zero for
+                   all other species. shape = (n, m)
+    :param net_stos: (np.ndarray) Stoichiometry of the products minus that of
+                     the reactants. shape = (n, m)
+    :return: (np.ndarray) shape = (m,)
+    """
+    rates = ks * np.prod(concentrations ** orders, axis=1)
+    return net_stos.T @ rates
+
+
+def vectorised_jacobian(concentrations, time, ks, orders, net_stos):
+    """
+    Calculate the Jacobian of the derivative with arrays as for
+    vectorised_derivative(). Used in place of jacobian() if numba is not
+    installed
+
+    :return: (np.ndarray) shape = (m, m)
+    """
+    n_species = concentrations.shape[0]
+    powers = concentrations ** orders
+
+    # Products of the powers of all but one species (l) for each reaction,
+    # with shape (n, m) and element (j, l)
+    powers = np.repeat(powers[:, np.newaxis, :], n_species, axis=1)
+    powers[:, np.arange(n_species), np.arange(n_species)] = 1.0
+    other_products = np.prod(powers, axis=2)
+
+    # ∂r_j/∂c_l = k_j S_{j,l} c_l^(S_{j,l} - 1) Π_{k!=l} c_k^S_{j,k}
+    d_powers = np.power(concentrations, orders - 1,
+                        out=np.zeros_like(orders, dtype=float),
+                        where=orders > 0)
+    d_rates = ks[:, np.newaxis] * orders * d_powers * other_products
+
+    return net_stos.T @ d_rates
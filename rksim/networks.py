@@ -1,6 +1,5 @@
 import networkx as nx
-from rksim.plotting import show_or_plot
-from copy import deepcopy
+from copy import copy
 
 
 class Network(nx.DiGraph):
@@ -12,34 +11,39 @@ class Network(nx.DiGraph):
         :param self: (rksim.networks.Network)
         :param reactions: (list(rksim.systems.Reaction))
         """
-        # List to ensure no species is added more than once to the network
-        added_names = []
+        # Set to ensure no species is added more than once to the network
+        added_names = set()
 
-        # Number of added nodes (iterator)
-        n = 0
+        # Nodes as (index, attributes) to add to the graph all at once
+        nodes = []
 
         for reaction in reactions:
-            for species in deepcopy(reaction.components):
+            for species in reaction.components:
 
-                # A species only has a stoichiometry in a reaction
-                species.stoichiometry = None
-
-                # Skip adding the node if already added
+                # Skip adding the node if already added, before copying the
+                # species as the same species appear in many reactions
                 if species.name in added_names:
                     continue
 
-                # Add this name to the list so it won't be added twice
-                added_names.append(species.name)
+                # Add this name to the set so it won't be added twice
+                added_names.add(species.name)
+
+                # A species only has a stoichiometry in a reaction. Only its
+                # attributes are set, so a shallow copy is enough
+                species = copy(species)
+                species.stoichiometry = None
+
+                # Map the name to the index of the node
+                n = len(nodes)
+                self.node_mapping[species.name] = n
 
-                # Add the node and step the iterator
-                self.add_node(n,  # index of the node
-                              name=species.name,  # name of the node
-                              c0=1E-15,           # initial concentration
-                              species=species)    # rksim.species.Species
-                n += 1
+                # Index of the node, name, initial concentration and the
+                # rksim.species.Species
+                nodes.append((n, {'name': species.name,
+                                  'c0': 1E-15,
+                                  'species': species}))
 
-        # Set the mapping between node names and node indexes
-        self.set_node_mapping()
+        self.add_nodes_from(nodes)
         return None
 
     def set_node_mapping(self):
@@ -52,6 +56,9 @@ class Network(nx.DiGraph):
 
     def plot(self, name=None):
         """Plot a reaction network using NetworkX and matplotlib"""
+        # Import here as matplotlib is slow to import and not needed to fit
+        from rksim.plotting import show_or_plot
+
         nx.draw_networkx(self)
 
         return show_or_plot(name)
@@ -12,16 +12,15 @@ mpl.rcParams['ytick.direction'] = 'in'
 mpl.rcParams['xtick.top'] = True
 mpl.rcParams['ytick.right'] = True
 mpl.rcParams['axes.linewidth'] = 1.2
-plt.ticklabel_format(style='sci', axis='x', scilimits=(0, 0))
+
+# Colors used to plot consistently, with one per series
+colors = plt.get_cmap('tab10').colors
 
 
 def plot(generator, name=None, time_units='s', conc_units='mol dm$^{-3}$'):
     """Plot a series of times series with matplotlib"""
-    # Plot with consistent colors
-    cm = plt.get_cmap('tab10')
-
     for i, item in enumerate(generator):
-        color = cm.colors[i % 10]
+        color = colors[i % len(colors)]
 
         # Plot a time series directly
         if hasattr(item, 'times'):
@@ -46,7 +45,8 @@ def plot(generator, name=None, time_units='s', conc_units='mol dm$^{-3}$'):
                      label=f'{series.name} simulated',
                       ls='--', color=color)
 
-    # Legend and axis labels
+    # Legend and axis labels, with times in scientific notation
+    plt.ticklabel_format(style='sci', axis='x', scilimits=(0, 0))
     plt.legend()
     conc_units = "" if conc_units is None else f'/ {conc_units}'
     plt.ylabel(f'Concentration {conc_units}')
@@ -1,23 +1,26 @@
 from rksim.species import Reactant, Product
 import rksim.exceptions as ex
 import numpy as np
-from copy import deepcopy
+from copy import copy
 
 
 def prune_species(components):
     """Remove any duplicates and set stoichiometries"""
-    unique_names = set(species.name for species in components)
+    # Group the identical species by name in a single pass
+    identical_species = {}
+    for species in components:
+        identical_species.setdefault(species.name, []).append(species)
+
     unique_species = []
 
-    for name in unique_names:
-        identical_species = [s for s in components if s.name == name]
+    for species_list in identical_species.values():
 
         # Add this species only once
-        species = identical_species[0]
+        species = species_list[0]
 
         # The order in this species is the number of times it appears
         # as either a reactant or product
-        species.stoichiometry = len(identical_species)
+        species.stoichiometry = len(species_list)
 
         unique_species.append(species)
 
@@ -27,18 +30,41 @@ def prune_species(components):
 
 class Reaction:
 
+    __slots__ = ('components', '_ks', '_k_idx', '_reactants', '_products',
+                 '_ordered_names', '_stos')
+
+    @property
+    def k(self):
+        """Rate constant of this reaction"""
+        return float(self._ks[self._k_idx])
+
+    @k.setter
+    def k(self, value):
+        """Set the rate constant, in the array of rate constants shared
+        with a reaction set if this reaction is in one"""
+        self._ks[self._k_idx] = value
+
     def __str__(self):
         return (f'Reaction({"+".join(r.name for r in self.reactants())} -> '
                 f'{"+".join(p.name for p in self.products())})')
 
     def _components(self, species_class):
         """Get the components of a particular class"""
+        return tuple(species for species in self.components
+                     if isinstance(species, species_class))
 
-        for species in self.components:
-            if isinstance(species, species_class):
-                yield species
+    def _cache_components(self):
+        """Cache the reactants, products, their names and stoichiometries,
+        which are fixed once the components are set"""
+        self._reactants = self._components(Reactant)
+        self._products = self._components(Product)
 
-        return StopIteration
+        self._ordered_names = tuple(species.name for species
+                                    in self._reactants + self._products)
+
+        self._stos = {species.name: species.stoichiometry
+                      for species in self.components}
+        return None
 
     def swap_reactants_and_products(self):
         """Switch reactants to products e.g. R -> P :-> P -> R"""
@@ -52,13 +78,12 @@ class Reaction:
             else:
                 raise ex.RKSimCritical('Had unknown species in reaction')
 
+        self._cache_components()
         return None
 
     def ordered_names(self):
-        """Get a list """
-        reactant_names = [r.name for r in self.reactants()]
-        product_names = [p.name for p in self.products()]
-        return reactant_names + product_names
+        """Get a list of the reactant then product names"""
+        return list(self._ordered_names)
 
     def is_reversible(self):
         """Is this reaction reversible?"""
@@ -71,20 +96,15 @@ class Reaction:
 
     def reactants(self):
         """Get the next reactant in this reaction"""
-        return self._components(Reactant)
+        return iter(self._reactants)
 
     def products(self):
         """Get the next reactant in this reaction"""
-        return self._components(Product)
+        return iter(self._products)
 
     def sto(self, name):
         """Get the stoichiometry of a named component in this reaction"""
-
-        for species in self.components:
-            if species.name == name:
-                return species.stoichiometry
-
-        return 0
+        return self._stos.get(name, 0)
 
     def _init_from_string(self, string):
         """Initialise a reaction from a string e.g. A+B->C"""
@@ -104,19 +124,29 @@ class Reaction:
         else:
             self.components = prune_species(args)
 
-        self.k = k                            # Rate constant
+        self._cache_components()
+
+        # Rate constant, stored as an element of an array so a reaction set
+        # can hold the rate constants of all its reactions contiguously
+        self._ks, self._k_idx = np.array([k], dtype=float), 0
 
 
 class IrreversibleReaction(Reaction):
     """Irreversible reaction"""
 
+    __slots__ = ()
+
 
 class ReversibleReaction(Reaction):
     """Reversible reaction"""
 
+    __slots__ = ()
+
 
 class ReactionSet:
 
+    __slots__ = ('reactions', 'reaction_mapping', '_ks')
+
     def __str__(self):
         rxn_str = "\n\t".join(str(rxn) for rxn in self.reactions)
         return f'Reactions({rxn_str})'
@@ -135,8 +165,6 @@ class ReactionSet:
             for species in reaction.components:
                 yield species
 
-        return StopIteration
-
     def rate_constant(self, *args):
         """
         Get a named rate constant from the constituent species e.g. for a
@@ -146,11 +174,11 @@ class ReactionSet:
         :param species_names: (list(str))
         """
 
-        for reaction in self.reactions:
-            if list(args) == reaction.ordered_names():
-                return reaction.k
+        try:
+            return self.reaction_mapping[args].k
 
-        raise ex.CannotGetAttribute('Reaction not found')
+        except (KeyError, TypeError):
+            raise ex.CannotGetAttribute('Reaction not found')
 
     def set_rate_constant(self, *args, k):
         """Get a named rate constant
@@ -159,20 +187,29 @@ class ReactionSet:
                      index in the system
         :param k: (float) Rate constant
         """
-
-        for i, reaction in enumerate(self.reactions):
-            if list(args) == reaction.ordered_names():
-                reaction.k = k
+        # An integer index can be set directly, without generating the names
+        # of all the reactions before it. Booleans are excluded as numpy
+        # would index all the rate constants with them
+        if (isinstance(args[0], (int, np.integer))
+                and not isinstance(args[0], (bool, np.bool_))
+                and 0 <= args[0] < len(self.reactions)):
+            self._ks[args[0]] = k
+            return
+
+        if args in self.reaction_mapping:
+            self.reaction_mapping[args].k = k
+            return
+
+        try:
+            # Index may also be given as e.g. a string
+            idx = int(args[0])
+            if 0 <= idx < len(self.reactions):
+                self.reactions[idx].k = k
                 return
 
-            try:
-                if int(args[0]) == i:
-                    reaction.k = k
-                    return
-
-            except ValueError:
-                # argument not an integer
-                continue
+        except ValueError:
+            # argument not an integer
+            pass
 
         raise ex.CannotSetAttribute(f'Reaction not found: {args}')
 
@@ -190,15 +227,27 @@ class ReactionSet:
         if len(ks) != n:
             raise ex.CannotSetAttribute('Incorrect number of rate constants')
 
-        # Set the rate constants for all reactions
-        for i, reaction in enumerate(self.reactions):
-            reaction.k = ks[i]
-
+        # Set the rate constants for all reactions at once
+        self._ks[:] = ks
         return None
 
     def rate_constants(self):
-        """YGet a numpy array of rate constants"""
-        return np.array([reaction.k for reaction in self.reactions])
+        """Get a numpy array of rate constants"""
+        return self._ks.copy()
+
+    def set_rate_constant_array(self):
+        """
+        Store the rate constants of all reactions in a single array, which
+        the reactions then share. The reactions are copies owned by this set
+        (see add_reverse_reactions), so no other set shares the array
+        """
+        self._ks = np.array([reaction.k for reaction in self.reactions],
+                            dtype=float)
+
+        for i, reaction in enumerate(self.reactions):
+            reaction._ks, reaction._k_idx = self._ks, i
+
+        return None
 
     def add_reverse_reactions(self):
         """If there are reversible reactions swap for irreversible
@@ -207,6 +256,11 @@ class ReactionSet:
 
         for reaction in self.reactions:
 
+            # Copy the reaction so that it only belongs to this set, as it
+            # will share the rate constant array of this set. The components
+            # are not modified so don't need to be copied
+            reaction = copy(reaction)
+
             # Don't modify irreversible forward reactions
             if not reaction.is_reversible():
                 reactions.append(reaction)
@@ -215,18 +269,38 @@ class ReactionSet:
             # Add the forward reaction
             reactions.append(reaction)
 
-            # Copy the forward reaction, swap it and append to the list
-            swapped_reaction = deepcopy(reaction)
+            # Copy the forward reaction and its components, swap it and
+            # append to the list. Swapping resets the cached components, so
+            # shallow copies are enough
+            swapped_reaction = copy(reaction)
+            swapped_reaction.components = [copy(species)
+                                           for species in reaction.components]
             swapped_reaction.swap_reactants_and_products()
 
             reactions.append(swapped_reaction)
 
         # Reset the reactions with the fully populated list
         self.reactions = reactions
+        self.set_reaction_mapping()
+        self.set_rate_constant_array()
+        return None
+
+    def set_reaction_mapping(self):
+        """Set the mapping from the ordered species names to reactions"""
+        self.reaction_mapping = {}
+
+        for reaction in self.reactions:
+            names = tuple(reaction.ordered_names())
+
+            # Keep the first of any duplicate reactions
+            self.reaction_mapping.setdefault(names, reaction)
+
         return None
 
     def __init__(self, *args):
         """Set of reactions"""
 
         self.reactions = args
+        self.reaction_mapping = {}          # Mapping from names -> reactions
+        self._ks = None                     # Rate constants (np.ndarray)
         self.add_reverse_reactions()
@@ -1,18 +1,28 @@
+import sys
+
+
 class Species:
 
+    __slots__ = ('name', 'stoichiometry', 'series', 'simulated_series')
+
     def __str__(self):
         return self.name
 
     def __eq__(self, other):
         return self.name == other.name
 
+    def __hash__(self):
+        return hash(self.name)
+
     def __init__(self, name=None):
         """
         Generic molecular species e.g. both R and P in R -> P
 
         :param name: (str) Name of this species
         """
-        self.name = name
+        # Names are used as keys to look up species many times, so intern
+        # them to make the dictionary lookups faster
+        self.name = sys.intern(name) if isinstance(name, str) else name
 
         # Stoichiometry of species in a reaction e.g. R + R -> P,
         # R.stoichiometry = 2 and P.stoichiometry = 1
@@ -25,6 +35,10 @@ class Species:
 class Reactant(Species):
     """Reactant species e.g. R in R -> P"""
 
+    __slots__ = ()
+
 
 class Product(Species):
     """Product species e.g. P in R -> P"""
+
+    __slots__ = ()
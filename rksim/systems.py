@@ -1,9 +1,10 @@
 import numpy as np
 from rksim.data import TimeSeries
 import rksim.networks as nws
+import rksim.kernels as kernels
 from rksim.fit import fit
 from rksim.reactions import ReactionSet
-from rksim.plotting import plot
+from rksim.species import Reactant
 from rksim.exceptions import CannotSetAttribute
 
 
@@ -20,54 +21,138 @@ class System(ReactionSet):
 
         :return: (float)
         """
-        mse = 0
+        return np.sum(self.residuals(relative=relative) ** 2)
 
-        for species in self.species:
+    def residuals(self, relative=False, concentrations=None, times=None,
+                  data_idxs=None):
+        """
+        Calculate the differences between the true concentrations and the
+        simulated concentrations for all species with a time series. The sum
+        of their squares is the mean squared error
 
-            # Only compute the error on species with a time series
-            if species.series is None:
-                continue
+        :param concentrations: (np.ndarray | None) Simulated concentrations
+                               (mol dm^-3) of all species, shape = (n, m).
+                               If None then use the simulated time series
+                               set for each species
+
+        :param times: (np.ndarray | None) Times (s) of the simulated
+                      concentrations. shape = (n,)
+
+        :param data_idxs: (tuple(np.ndarray) | None) Indexes of the simulated
+                          concentrations compared to the data, from
+                          self.data_idxs(times). Calculated if None
+
+        :return: (np.ndarray)
+        """
+        if concentrations is not None:
+            if data_idxs is None:
+                data_idxs = self.data_idxs(times)
+
+            time_idxs, species_idxs, concs = data_idxs
+            diffs = concs - concentrations[time_idxs, species_idxs]
+
+        else:
+            concs, sim_concs = [np.array([])], [np.array([])]
+
+            for species in self.species:
+
+                # Only compute the error on species with a time series
+                if species.series is None:
+                    continue
+
+                # The simulated concentration need to be the one closet to
+                # each time as the real and simulated series could be over
+                # different times
+                sim_series = species.simulated_series
+                idxs = closest_idxs(sim_series.times, species.series.times)
+
+                concs.append(species.series.concentrations)
+                sim_concs.append(sim_series.concentrations[idxs])
+
+            concs = np.concatenate(concs)
+            diffs = concs - np.concatenate(sim_concs)
+
+        # Compute the relative error for a more reasonable fit to
+        # low and high concentration data
+        if relative:
+            positive = concs > 0
+            diffs[positive] /= np.sqrt(concs[positive])
+
+        return diffs
+
+    def data_idxs(self, times):
+        """
+        Get the indexes of the simulated concentrations, over a set of times,
+        closest to each point in the time series of all species with one.
+        These only depend on the times so can be calculated once per fit
 
-            # For each time compute the difference between the simulated
-            # concentration and the actual concentration. The simulated
-            # concentration need to be the one closet to the current t
-            # as the real and simulated series could be over different times
-            for i, time in enumerate(species.series.times):
+        :param times: (np.ndarray) Times (s) of the simulated concentrations.
+                      shape = (n,)
 
-                idx = (np.abs(species.simulated_series.times - time)).argmin()
+        :return: (tuple(np.ndarray)) Time and species indexes and the
+                 concentrations of the data, all shape = (l,) for l data
+                 points in total
+        """
+        time_idxs, species_idxs, concs = [], [], []
 
-                diff = (species.series.concentrations[i] -
-                        species.simulated_series.concentrations[idx])
+        for i, species in enumerate(self.species):
 
-                # Compute the square of the difference to make the function
-                # more smooth. Compute the relative error for a more
-                # reasonable fit to low and high concentration data
-                if relative and species.series.concentrations[i] > 0:
-                    mse += diff ** 2 / species.series.concentrations[i]
+            # Only compute the error on species with a time series
+            if species.series is None:
+                continue
 
-                else:
-                    mse += diff ** 2
+            time_idxs.append(closest_idxs(times, species.series.times))
+            species_idxs.append(np.full(len(species.series.times), i))
+            concs.append(species.series.concentrations)
 
-        return mse
+        return (np.concatenate([np.array([], dtype=int)] + time_idxs),
+                np.concatenate([np.array([], dtype=int)] + species_idxs),
+                np.concatenate([np.array([])] + concs))
 
     def set_initial_concentration(self, name, c):
         """
         Set the initial concentration (c0) for a species, given
-        its name. Will set the c0 node attribute
+        its name. Will set the c0 node attribute, from which the system is
+        simulated
 
         :param name: (str) Name of the species
         :param c: (float) Concentration (mol dm^-3)
         """
+        return self.set_initial_concentrations(names=[name], cs=[c])
+
+    def set_initial_concentrations(self, names, cs):
+        """
+        Set the initial concentrations (c0) for a list of species, given
+        their names, as the c0 attributes of their nodes. Allows e.g.
+        Data.assign to set all the initial concentrations with one call
+
+        :param names: (list(str)) Names of the species
+        :param cs: (list(float) | np.ndarray) Concentrations (mol dm^-3)
+        """
+        cs = np.asarray(cs, dtype=float)
+
+        if len(names) != len(cs):
+            raise CannotSetAttribute('Need one concentration per species')
+
         try:
-            node_index = self.network.node_mapping[name]
+            node_idxs = [self.network.node_mapping[name] for name in names]
 
         except KeyError:
             raise CannotSetAttribute('Species not found in the network')
 
-        # Set the value
-        self.network.nodes[node_index]['c0'] = float(c)
+        # Set the values
+        for i, c in zip(node_idxs, cs):
+            self.network.nodes[i]['c0'] = float(c)
+
         return None
 
+    def initial_concentrations(self):
+        """Get a numpy array of the initial concentrations of all species,
+        from the c0 attributes of the nodes so setting those directly is also
+        respected"""
+        nodes = self.network.nodes
+        return np.array([nodes[i]['c0'] for i in nodes], dtype=float)
+
     def set_simulated(self, concentrations, times):
         """
         Set concentrations as a function of time for all species in this
@@ -85,9 +170,10 @@ class System(ReactionSet):
             # columns as the different species
             concs = concentrations[:, i]
 
-            # If a time series is already set only update the concentrations
+            # If a time series is already set over the same times only update
+            # the concentrations
             if (species.simulated_series is not None
-                    and len(concs) == len(species.simulated_series.times)):
+                    and species.simulated_series.times is times):
                 species.simulated_series.concentrations = concs
 
             # Otherwise set the time series
@@ -95,7 +181,8 @@ class System(ReactionSet):
                 species.simulated_series = TimeSeries(name=species.name,
                                                       times=times,
                                                       concentrations=concs,
-                                                      simulated=True)
+                                                      simulated=True,
+                                                      check=False)
         return None
 
     def set_stoichiometries(self):
@@ -107,17 +194,54 @@ class System(ReactionSet):
         # species as columns
         self.stos = np.zeros(shape=(n, m, 2))
 
-        for i, reaction in enumerate(self.reactions):
-            reactant_names = [r.name for r in reaction.reactants()]
+        # Only the species in each reaction have a non-zero stoichiometry, so
+        # look up their indexes rather than searching every species in the
+        # network. Final idx is 0 if this species is a Reactant or 1 if
+        # Product. Elements are set all at once from (i, j, k, sto) tuples
+        mapping = self.network.node_mapping
+        elements = []
 
-            for species_name, j in self.network.node_mapping.items():
+        for i, reaction in enumerate(self.reactions):
+            for species in reaction.components:
+                k = 0 if isinstance(species, Reactant) else 1
+                elements.append((i, mapping[species.name], k,
+                                 species.stoichiometry))
+
+        if len(elements) > 0:
+            i, j, k, stos = zip(*elements)
+            self.stos[i, j, k] = stos
+
+        # Non-zero elements of the stoichiometry matrix used to calculate the
+        # derivative
+        r_stos, p_stos = self.stos[:, :, 0], self.stos[:, :, 1]
+        self._r_idxs, self._r_stos = nonzero_stoichiometries(r_stos)
+        self._p_idxs, self._p_stos = nonzero_stoichiometries(p_stos)
+
+        # Dense reaction orders and net stoichiometries for when the
+        # derivative is evaluated with numpy, rather than a numba kernel
+        self._orders = np.ascontiguousarray(r_stos)
+        self._net_stos = p_stos - r_stos
+        return None
 
-                # Final idx is 0 if this species is a Reactant or 1 if Product
-                k = 0 if species_name in reactant_names else 1
+    def derivative_kernels(self):
+        """
+        Get the functions that calculate the derivative and the Jacobian of
+        the concentrations, both f(concentrations, time, *args), along with
+        the arguments. The rate constants are the array shared with the
+        reactions, so not copied. These can be given directly to an
+        integrator, avoiding a Python method call per step
 
-                self.stos[i, j, k] = reaction.sto(species_name)
+        :return: (tuple(function, function, tuple))
+        """
+        if not kernels.has_numba:
+            return (kernels.vectorised_derivative,
+                    kernels.vectorised_jacobian,
+                    (self._ks, self._orders, self._net_stos))
 
-        return None
+        return (kernels.derivative,
+                kernels.jacobian,
+                (self._ks, self._r_idxs, self._r_stos,
+                 self._p_idxs, self._p_stos))
 
     def component_derivative(self, i, concentrations):
         """Calculate the derivative with respect to a component i in the
@@ -130,42 +254,10 @@ class System(ReactionSet):
                     j ∈ R              k               )
 
         where P is the set of reactions where i is a product and R is the
-        set of reactions where i is a reactant
+        set of reactions where i is a reactant. Evaluated with the derivative
+        of all the components, so use derivative() if more than one is needed
         """
-        n = len(concentrations)
-        inflow, outflow = 0.0, 0.0
-
-        for j, reaction in enumerate(self.reactions):
-
-            # If this component is outflowing
-            if self.stos[j, i, 0] != 0:
-                conc = self.stos[j, i, 0]
-
-                for k in range(n):
-
-                    # If the reactant is not present then the stoichometry
-                    # is 0 and conc will be multipled by 1
-                    conc *= concentrations[k] ** self.stos[j, k, 0]
-
-                # Add e.g. k[A][B]^2 to the outflow for this reaction
-                outflow += reaction.k * conc
-
-            # If this component is inflow
-            if self.stos[j, i, 1] != 0:
-
-                # Product concentration is just the stoichiometry e.g. for
-                # i == C in A -> 2C then sto = 2
-                conc = self.stos[j, i, 1]
-
-                # For all the reactants in this reaction multiply by
-                # their concentration raised to the power of their
-                # stoichiometry
-                for k in range(n):
-                    conc *= concentrations[k] ** self.stos[j, k, 0]
-
-                inflow += reaction.k * conc
-
-        return inflow - outflow
+        return self.derivative(concentrations)[i]
 
     def derivative(self, concentrations, time=0.0):
         """
@@ -178,23 +270,36 @@ class System(ReactionSet):
                                dm^-3 shape = (n,) where n is the number of
                                components (species in this system). Must be >0
         """
-        n_components = len(concentrations)
-        return np.array([self.component_derivative(i, concentrations)
-                         for i in range(n_components)])
+        derivative, _, args = self.derivative_kernels()
+        return derivative(np.asarray(concentrations, dtype=float),
+                          time, *args)
 
-    @property
-    def species(self):
-        """Get the next species in this system from the reaction network"""
+    def jacobian(self, concentrations, time=0.0):
+        """
+        Calculate the Jacobian of the derivative with respect to the
+        concentrations, J_ij = ∂(dc_i/dt)/∂c_j
 
-        for i in self.network.nodes:
-            yield self.network.nodes[i]['species']
+        :param time: (float) Time in s ((needs to be a parameter for odeint))
 
-        return None
+        :param concentrations: (np.ndarray) array of concentrations in mol
+                               dm^-3 shape = (n,)
+
+        :return: (np.ndarray) shape = (n, n)
+        """
+        _, jacobian, args = self.derivative_kernels()
+        return jacobian(np.asarray(concentrations, dtype=float),
+                        time, *args)
+
+    @property
+    def species(self):
+        """Get the next species in this system from the reaction network.
+        Iterates over the cached list of species, so no generator is needed"""
+        return iter(self._species)
 
     def simulate(self, max_time):
         """Simulate this system to time = max_time"""
 
-        if all(self.network.nodes[i]['c0'] < 1E-8 for i in self.network.nodes):
+        if np.all(self.initial_concentrations() < 1E-8):
             raise RuntimeError('Cannot simulate a system with all zero '
                                'concentrations. Set some concentrations with'
                                ' set_initial_concentration()')
@@ -210,6 +315,8 @@ class System(ReactionSet):
 
     def plot(self, name='system',exc_species=None):
         """Plot both the simulated and experimental data for this system"""
+        from rksim.plotting import plot
+
         species = self.species
 
         if exc_species is not None:
@@ -220,7 +327,9 @@ class System(ReactionSet):
     def __init__(self, *args):
         """
         System of reactions. Subclass of ReactionSet with a self.reactions
-        attribute
+        attribute, holding copies of the reactions. Rate constants set or
+        fitted are then only those of this system, and not of the reactions
+        given
 
         :param args: (rksim.system.Reaction)
         """
@@ -229,6 +338,68 @@ class System(ReactionSet):
         # Network of unique components in the system
         self.network = nws.Network(*args)
 
-        # Stoichiometry matrix (np.ndarray)
+        # Species as a flat list in the same order as the nodes, so the
+        # network need not be traversed
+        nodes = self.network.nodes
+        self._species = [nodes[i]['species'] for i in nodes]
+
+        # Stoichiometry matrix (np.ndarray) and the indexes and values of the
+        # reactant and product stoichiometries in each reaction
         self.stos = None
+        self._r_idxs, self._r_stos = None, None
+        self._p_idxs, self._p_stos = None, None
+        self._orders, self._net_stos = None, None
+
         self.set_stoichiometries()
+
+
+def nonzero_stoichiometries(stos):
+    """
+    Get the indexes of the species with a non-zero stoichiometry in each
+    reaction along with those stoichiometries. Rows are padded with zero
+    stoichiometries so all reactions have the same number of entries
+
+    :param stos: (np.ndarray) Stoichiometries with reactions as rows and
+                 species as columns. shape = (n, m)
+
+    :return: (tuple(np.ndarray)) Indexes and stoichiometries, both
+             shape = (n, l) where l is the maximum number of species with a
+             non-zero stoichiometry in a single reaction
+    """
+    n_cols = max([np.count_nonzero(row) for row in stos] + [1])
+
+    idxs = np.zeros(shape=(len(stos), n_cols), dtype=np.int64)
+    nonzero_stos = np.zeros(shape=(len(stos), n_cols), dtype=np.int64)
+
+    for i, row in enumerate(stos):
+        js = np.flatnonzero(row)
+
+        idxs[i, :len(js)] = js
+        nonzero_stos[i, :len(js)] = row[js]
+
+    return idxs, nonzero_stos
+
+
+def closest_idxs(sorted_times, times):
+    """
+    Get the indexes of the closest times in a sorted array to each of a set
+    of times, taking the first if two are equally close. Uses a binary search
+    rather than computing all the differences
+
+    :param sorted_times: (np.ndarray) Monotonically increasing times. shape =
+                         (n,)
+    :param times: (np.ndarray) shape = (l,)
+    :return: (np.ndarray) Indexes into sorted_times. shape = (l,)
+    """
+    if len(sorted_times) == 1:
+        return np.zeros(len(times), dtype=int)
+
+    # Index of the first time ≥ each time, and so the one before is < it
+    idxs = np.clip(np.searchsorted(sorted_times, times), 1,
+                   len(sorted_times) - 1)
+
+    before = (times - sorted_times[idxs - 1]) <= (sorted_times[idxs] - times)
+    idxs = np.where(before, idxs - 1, idxs)
+
+    # Take the first of any repeated times
+    return np.searchsorted(sorted_times, sorted_times[idxs])
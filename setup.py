@@ -10,4 +10,5 @@ setup(name='rksim',
                         'networkx',
                         'scipy',
                         'matplotlib'],
+      extras_require={'numba': ['numba']},
       author='Tom Young')
@@ -0,0 +1,17 @@
+from rksim.systems import System
+from rksim.reactions import IrreversibleReaction, ReversibleReaction
+from rksim.species import Reactant, Product
+import pytest
+
+
+@pytest.fixture
+def michaelis_menten_system():
+    # E + S <--> ES -> E + P,  2A -> B
+    system = System(ReversibleReaction(Reactant('E'), Reactant('S'),
+                                       Product('ES')),
+                    IrreversibleReaction(Reactant('ES'), Product('E'),
+                                         Product('P')),
+                    IrreversibleReaction(Reactant('A'), Reactant('A'),
+                                         Product('B')))
+    system.set_rate_constants([1.0, 0.03, 2.0, 0.5])
+    return system
@@ -5,6 +5,7 @@ from rksim.reactions import IrreversibleReaction
 from rksim.species import Reactant, Product
 from rksim.systems import System
 from rksim.exceptions import RKSimCritical, DataMalformatted
+import rksim.data
 import pytest
 import numpy as np
 import os
@@ -38,6 +39,28 @@ def test_time_series():
     assert ts.times.shape == (3,)
     assert ts.concentrations.shape == (3,)
 
+    # Checking can be skipped for series known to be valid, so decreasing
+    # times are kept as given
+    decreasing_times = np.linspace(0, -1, 3)
+    ts = TimeSeries(name='test', times=decreasing_times,
+                    concentrations=concs, check=False)
+    assert np.allclose(ts.times, decreasing_times)
+
+    with pytest.raises(AssertionError):
+        _ = TimeSeries(name='test', times=decreasing_times,
+                       concentrations=concs, check=True)
+
+
+def test_extract_data_checked(tmp_path):
+    # Only the first series of a file with many is checked, but they all share
+    # the same times so decreasing times should still be rejected
+    data_path = os.path.join(tmp_path, 'data.csv')
+    with open(data_path, 'w') as data_file:
+        print('0.0,1.0,0.0\n2.0,0.5,0.5\n1.0,0.2,0.8', file=data_file)
+
+    with pytest.raises(AssertionError):
+        _ = extract_data(data_path, names=['R', 'P'])
+
 
 def test_data_invalid1():
 
@@ -157,3 +180,41 @@ def test_simple_fit():
     system.plot()
     assert os.path.exists('system.pdf')
     os.remove('system.pdf')
+
+
+def test_data_cached(tmp_path):
+
+    data_path = os.path.join(tmp_path, 'data.csv')
+    with open(data_path, 'w') as data_file:
+        print('0.0,1.0\n1.0,0.5', file=data_file)
+
+    series1 = extract_data(data_path)[0]
+    series2 = extract_data(data_path)[0]
+    assert np.allclose(series1.concentrations, series2.concentrations)
+
+    # Arrays from the cache should be copies
+    series1.concentrations[0] = 2.0
+    assert np.isclose(series2.concentrations[0], 1.0)
+
+    # and a modified file re-read
+    with open(data_path, 'w') as data_file:
+        print('0.0,0.25\n1.0,0.5', file=data_file)
+
+    series3 = extract_data(data_path)[0]
+    assert np.isclose(series3.concentrations[0], 0.25)
+
+
+def test_data_cache_size(tmp_path):
+
+    for i in range(rksim.data.max_parsed_arrays + 1):
+        data_path = os.path.join(tmp_path, f'data{i}.csv')
+        with open(data_path, 'w') as data_file:
+            print(f'0.0,{i}.0\n1.0,0.5', file=data_file)
+
+        _ = extract_data(data_path)
+
+    assert len(rksim.data._parsed_arrays) == rksim.data.max_parsed_arrays
+
+    # with the oldest removed
+    oldest_path = os.path.join(tmp_path, 'data0.csv')
+    assert oldest_path not in rksim.data._parsed_arrays
@@ -0,0 +1,57 @@
+from rksim.systems import System
+from rksim.reactions import IrreversibleReaction
+from rksim.species import Reactant, Product
+import rksim.kernels as kernels
+import numpy as np
+import pytest
+
+
+def loop_args(system):
+    return (system._ks, system._r_idxs, system._r_stos,
+            system._p_idxs, system._p_stos)
+
+
+def vectorised_args(system):
+    return system._ks, system._orders, system._net_stos
+
+
+def test_derivative_kernels(michaelis_menten_system):
+    # Loop kernels are used if numba is installed and run uncompiled if not,
+    # so both should agree with the numpy ones
+    system = michaelis_menten_system
+    concs = np.array([0.1, 0.001, 1.0, 0.02, 0.7, 0.1])
+
+    dcdt = kernels.derivative(concs, 0.0, *loop_args(system))
+    assert dcdt.shape == (6,)
+    assert np.allclose(dcdt, kernels.vectorised_derivative(
+        concs, 0.0, *vectorised_args(system)))
+
+    jac = kernels.jacobian(concs, 0.0, *loop_args(system))
+    assert jac.shape == (6, 6)
+    assert np.allclose(jac, kernels.vectorised_jacobian(
+        concs, 0.0, *vectorised_args(system)))
+
+
+@pytest.mark.parametrize('n', [0, 1, 2, 3, 4])
+def test_int_power(n):
+    # Padding, unit, second and third order stoichiometries are multiplied
+    # out, along with the general case
+    assert np.isclose(kernels.int_power(1.7, n), 1.7 ** n)
+    assert kernels.int_power(0.0, 0) == 1.0
+
+
+@pytest.mark.parametrize('sto', [1, 2, 3])
+def test_kernels_stoichiometry(sto):
+    # nA -> B has rate k[A]^n
+    system = System(IrreversibleReaction(*(sto * [Reactant('A')]),
+                                         Product('B')))
+    system.set_rate_constants([0.5])
+    concs = np.array([0.2, 0.1])
+
+    rate = 0.5 * 0.2 ** sto
+    assert np.allclose(kernels.derivative(concs, 0.0, *loop_args(system)),
+                       [-sto * rate, rate])
+
+    jac = kernels.jacobian(concs, 0.0, *loop_args(system))
+    assert np.allclose(jac, kernels.vectorised_jacobian(
+        concs, 0.0, *vectorised_args(system)))
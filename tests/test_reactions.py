@@ -78,6 +78,21 @@ def test_reaction_set():
     # Reverse reaction should still have k = 1.0
     assert rxn_set2.rate_constant('P', 'R') == 1.0
 
+    # Rate constants set on the set and on the reactions are the same
+    rxn_set2.set_rate_constants(ks=[3.0, 4.0])
+    assert rxn_set2.reactions[1].k == 4.0
+
+    rxn_set2.reactions[0].k = 5.0
+    assert rxn_set2.rate_constants()[0] == 5.0
+
+    # Rate constants can be set by index, with a boolean as 0 or 1 rather
+    # than indexing all of them
+    rxn_set2.set_rate_constant(1, k=6.0)
+    assert list(rxn_set2.rate_constants()) == [5.0, 6.0]
+
+    rxn_set2.set_rate_constant(True, k=7.0)
+    assert list(rxn_set2.rate_constants()) == [5.0, 7.0]
+
     # Cannot set a reaction set with a single reaction with two rate constants
     with pytest.raises(ex.CannotSetAttribute):
         rxn_set.set_rate_constants(ks=[1.0, 1.0])
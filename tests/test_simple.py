@@ -115,3 +115,82 @@ def test_simple_consecutive():
     # Data generated with k1 = 0.5  and k2 = 0.8 s^-1
     assert np.abs(system.rate_constant('A', 'B') - 0.5) < 1E-3
     assert np.abs(system.rate_constant('B', 'C') - 0.8) < 1E-3
+
+
+def test_fit_batch():
+    # R -> P and R <-> P
+    systems = [System(IrreversibleReaction(Reactant('R'), Product('P'))),
+               System(ReversibleReaction(Reactant('R'), Product('P')))]
+
+    data_path = os.path.join(here, 'simple_data', 'first_order.csv')
+    data = Data()
+    data += extract_data(filename=data_path, names=['P', 'R'])
+
+    fitted_systems = data.fit_batch(systems, n_cores=2)
+    assert len(fitted_systems) == 2
+
+    # Systems that were fitted are copies
+    assert systems[0].rate_constant('R', 'P') == 1.0
+
+    # Data generated with k = 1.0 s^-1, both should fit well
+    for system in fitted_systems:
+        assert np.abs(system.mse()) < 1E-2
+        assert np.abs(system.rate_constant('R', 'P') - 1.0) < 1E-2
+
+
+def test_shared_reaction():
+    # R -> P used in two different systems
+    reaction = IrreversibleReaction(Reactant('R'), Product('P'), k=0.3)
+    system_a = System(reaction)
+    system_b = System(reaction,
+                      IrreversibleReaction(Reactant('P'), Product('Q')))
+
+    data_path = os.path.join(here, 'simple_data', 'first_order.csv')
+    data = Data()
+    data += extract_data(filename=data_path, names=['P', 'R'])
+    data.fit(system_a)
+
+    # Rate constants should be consistent within the fitted system and
+    # not change those of the other system, or the original reaction
+    k = system_a.rate_constant('R', 'P')
+    assert np.abs(k - 1.0) < 1E-2
+    assert np.isclose(system_a.rate_constants()[0], k)
+
+    assert system_b.rate_constant('R', 'P') == 0.3
+    assert reaction.k == 0.3
+
+    # Setting by name should change the rate constants used to simulate
+    system_a.set_rate_constant('R', 'P', k=5.0)
+    assert system_a.rate_constants()[0] == 5.0
+    assert system_a.derivative([0.0, 1.0])[1] == -5.0
+    assert system_b.rate_constants()[0] == 0.3
+
+
+def test_negative_initial_k():
+    # R -> P with a starting rate constant outside the bounds of the fit
+    system = System(IrreversibleReaction(Reactant('R'), Product('P'),
+                                         k=-0.5))
+
+    data_path = os.path.join(here, 'simple_data', 'first_order.csv')
+    data = Data()
+    data += extract_data(filename=data_path, names=['P', 'R'])
+    data.fit(system)
+
+    # Data generated with k = 1.0
+    assert np.abs(system.rate_constant('R', 'P') - 1.0) < 1E-2
+
+
+def test_tiny_initial_k():
+    # R -> P with starting rate constants too small for the first step of the
+    # optimiser to move, but still in the bounds of the fit
+    for k in (1E-12, 1E-9):
+        system = System(IrreversibleReaction(Reactant('R'), Product('P'),
+                                             k=k))
+
+        data_path = os.path.join(here, 'simple_data', 'first_order.csv')
+        data = Data()
+        data += extract_data(filename=data_path, names=['P', 'R'])
+        data.fit(system)
+
+        # Data generated with k = 1.0
+        assert np.abs(system.rate_constant('R', 'P') - 1.0) < 1E-2
@@ -1,4 +1,4 @@
-from rksim.systems import System
+from rksim.systems import System, closest_idxs
 from rksim.reactions import IrreversibleReaction, ReversibleReaction, Reaction
 from rksim.species import Reactant, Product
 from rksim.exceptions import CannotSetAttribute, CannotGetAttribute
@@ -108,6 +108,18 @@ def test_fit():
     # Data generated with k=1.0 s^-1
     assert np.abs(system.rate_constant('R', 'P') - 1.0) < 1E-2
 
+    # Residuals from a concentration array should be the same as from the
+    # simulated time series
+    times = system.network.nodes[0]['species'].simulated_series.times
+    concs = np.array([species.simulated_series.concentrations
+                      for species in system.species]).T
+
+    residuals = system.residuals(relative=True)
+    assert len(residuals) > 0
+    assert np.allclose(residuals, system.residuals(relative=True,
+                                                   concentrations=concs,
+                                                   times=times))
+
 
 def test_derivative1():
     # R -> P
@@ -128,6 +140,10 @@ def test_derivative1():
     expected_drdt = -1.0
     assert is_close(drdt, expected_drdt)
 
+    # Derivatives of single components are also available
+    assert is_close(system.component_derivative(0, concs), expected_dpdt)
+    assert is_close(system.component_derivative(1, concs), expected_drdt)
+
 
 def test_derivative2():
     # A + B -> C
@@ -318,6 +334,24 @@ def test_set_init_conc():
     with pytest.raises(CannotSetAttribute):
         system.set_initial_concentration(name='A', c=2.0)
 
+    # or a different number of concentrations to species
+    with pytest.raises(CannotSetAttribute):
+        system.set_initial_concentrations(names=['R', 'P'], cs=[1.0])
+
+
+def test_set_init_conc_node():
+    # R -> P
+    system = System(IrreversibleReaction(Reactant('R'), Product('P')))
+
+    # Setting the node attribute directly should also be used to simulate
+    r_idx = system.network.node_mapping['R']
+    system.network.nodes[r_idx]['c0'] = 2.0
+    assert is_close(system.initial_concentrations()[r_idx], 2.0)
+
+    system.simulate(max_time=10)
+    r_species = system.network.nodes[r_idx]['species']
+    assert is_close(r_species.simulated_series.concentrations[0], 2.0)
+
 
 def _test_set_rate_constant():
     # R -> P
@@ -341,3 +375,33 @@ def test_get_rate_constant():
 
     with pytest.raises(CannotGetAttribute):
         system.rate_constant('X', 'Y')
+
+
+def test_jacobian(michaelis_menten_system):
+    system = michaelis_menten_system
+
+    concs = np.array([0.1, 0.001, 1.0, 0.02, 0.7, 0.1])
+    jac = system.jacobian(concs)
+    assert jac.shape == (6, 6)
+
+    # Should be the same as a finite difference of the derivative
+    h = 1E-6
+    for j in range(len(concs)):
+        shift = np.zeros(len(concs))
+        shift[j] = h
+
+        fd = (system.derivative(concs + shift)
+              - system.derivative(concs - shift)) / (2 * h)
+        assert np.allclose(jac[:, j], fd, atol=1E-6)
+
+
+def test_closest_idxs():
+    sorted_times = np.array([0.0, 1.0, 1.0, 3.0])
+    times = np.array([-1.0, 0.5, 1.2, 2.0, 2.5, 4.0])
+
+    # Should be the same as the closest by argmin, taking the first of any
+    # equally close times
+    idxs = [np.abs(sorted_times - time).argmin() for time in times]
+    assert list(closest_idxs(sorted_times, times)) == idxs
+
+    assert list(closest_idxs(np.array([1.0]), times)) == 6 * [0]